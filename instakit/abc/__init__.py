@@ -17,9 +17,12 @@ Instakit’s Abstract Base Classes – née ABCs – for processors and data str
 """
 from __future__ import print_function
 
+import numpy
+
 from abc import ABC, abstractmethod
 from collections import defaultdict as DefaultDict
 from enum import Enum as EnumBase, EnumMeta
+from functools import lru_cache
 
 from clu.abstract import Slotted
 from clu.predicates import (getpyattr, isslotted,
@@ -36,10 +39,12 @@ exporter = Exporter(path=__file__)
 export = exporter.decorator()
 
 @export
+@lru_cache(maxsize=4096)
 def is_in_class(atx, cls):
     """ Test whether or not a class has a named attribute,
         regardless of whether the class uses `__slots__` or
-        an internal `__dict__`.
+        an internal `__dict__`. Results are memoized per
+        attribute name and class.
     """
     if hasattr(cls, '__slots__'):
         return atx in cls.__slots__
@@ -47,10 +52,17 @@ def is_in_class(atx, cls):
         return atx in cls.__dict__
     return False
 
+@lru_cache(maxsize=4096)
+def has_process(cls):
+    """ Test whether any class in the MRO of `cls` has a “process”
+        attribute -- walking the MRO only once per class.
+    """
+    return any(is_in_class('process', ancestor) for ancestor in cls.__mro__)
+
 @export
 def subclasshook(cls, subclass):
     """ A subclass hook function for both Processor and Enum """
-    if any(is_in_class('process', ancestor) for ancestor in subclass.__mro__):
+    if has_process(subclass):
         return True
     return NotImplemented
 
@@ -160,6 +172,13 @@ class NOOp(Processor):
     
     """ A no-op processor. """
     
+    @classmethod
+    def __subclasshook__(cls, subclass):
+        """ Only NOOp and its subclasses are NOOps -- unlike Processor, which
+            counts anything with a “process” attribute as one of its own
+        """
+        return NotImplemented
+    
     def process(self, image):
         """ Return the image instance, unchanged """
         return image
@@ -294,7 +313,7 @@ class Fork(MutableMapping):
             passed to the dict constructor, including keyword arguments.”
         
         """
-        if default_factory in (None, NOOp):
+        if default_factory is None or default_factory is NOOp:
             default_factory = NOOp
         if not callable(default_factory):
             raise AttributeError("Fork() requires a callable default_factory")
@@ -337,7 +356,7 @@ class Fork(MutableMapping):
            `idx` to the value passed, or if a value of “None” was passed,
             set the value to `instakit.abc.NOOp()` -- the no-op processor.
         """
-        if value in (None, NOOp):
+        if value is None or value is NOOp:
             value = NOOp()
         self.dict[idx] = value
     
@@ -380,13 +399,25 @@ class ThresholdProcessor(Processor):
     # This is used in instakit.processors.halftone
     __slots__ = tuplize('threshold_matrix')
     
-    LO_TUP = tuplize(0)
-    HI_TUP = tuplize(255)
-    
     def __init__(self, threshold = 128.0):
-        """ Initialize with a threshold value between 0 and 255 """
-        self.threshold_matrix = int(threshold)  * self.LO_TUP + \
-                           (256-int(threshold)) * self.HI_TUP
+        """ Initialize with a threshold value between 0 and 255.
+            
+            The threshold matrix is a 256-entry `numpy.ndarray` of dtype
+           ``uint8`` -- so a whole band can be thresholded in one vectorized
+            operation, e.g. `self.threshold_matrix[band_array]`, and the
+            matrix can be passed as-is to compiled kernels expecting a
+            contiguous ``uint8[::1]`` argument.
+        """
+        t = int(threshold)
+        self.threshold_matrix = numpy.concatenate((numpy.zeros(t,       dtype=numpy.uint8),
+                                                   numpy.full(256 - t, 255, dtype=numpy.uint8)))
+    
+    def __eq__(self, other):
+        """ Compare threshold matrices element-wise """
+        if type(self) is not type(other):
+            return NotImplemented
+        return numpy.array_equal(self.threshold_matrix,
+                                other.threshold_matrix)
 
 @export
 class NDProcessorBase(Processor):
@@ -438,26 +469,12 @@ def test():
     
     class SlowAtkinson(ThresholdProcessor):
         def process(self, image):
+            from PIL import Image
+            from instakit.utils.jit import atkinson_diffuse
             from instakit.utils.mode import Mode
-            image = Mode.L.process(image)
-            for y in range(image.size[1]):
-                for x in range(image.size[0]):
-                    old = image.getpixel((x, y))
-                    new = self.threshold_matrix[old]
-                    err = (old - new) >> 3 # divide by 8.
-                    image.putpixel((x, y), new)
-                    for nxy in [(x+1, y),
-                                (x+2, y),
-                                (x-1, y+1),
-                                (x, y+1),
-                                (x+1, y+1),
-                                (x, y+2)]:
-                        try:
-                            image.putpixel(nxy, int(
-                            image.getpixel(nxy) + err))
-                        except IndexError:
-                            pass
-            return image
+            buf = numpy.asarray(Mode.L.process(image)).copy()
+            atkinson_diffuse(buf, self.threshold_matrix)
+            return Image.fromarray(buf, 'L')
     
     from pprint import pprint
     slow_atkinson = SlowAtkinson()
@@ -8,30 +8,43 @@ Copyright (c) 2012 Objects In Space And Time, LLC. All rights reserved.
 """
 from __future__ import print_function
 
-from PIL import ImageDraw
+import numpy
+from PIL import Image, ImageDraw
 
 from instakit.utils import pipeline, gcr
+from instakit.utils.jit import atkinson_diffuse, HAS_NUMBA
 from instakit.utils.mode import Mode
 from instakit.utils.stats import histogram_mean
 from instakit.abc import Processor, ThresholdProcessor
 
 class SlowAtkinson(ThresholdProcessor):
     
-    """ It’s not a joke, this processor is slow as fuck;
-        if at all possible, use the cythonized version instead
-        (q.v. instakit.processors.ext.Atkinson) and never ever
-        use this one if at all possible – unless, like, you’re
+    """ It’s not a joke, this processor used to be slow as fuck -- these
+        days it hands its image data off to a compiled kernel (q.v.
+        `instakit.utils.jit.atkinson_diffuse(…)` sub.) when Numba is
+        installed, but the cythonized version (q.v. instakit.processors.ext.Atkinson)
+        is still the one to use if at all possible – unless, like, you’re
         being paid by the hour or somesuch. Up to you dogg.
     """
     __slots__ = tuple()
     
+    # The compiled kernel, which BandFork can also run across bands en masse:
+    kernel = staticmethod(atkinson_diffuse)
+    
     def process(self, image):
         """ The process call returns a monochrome ('L'-mode) image """
         image = Mode.L.process(image)
+        if HAS_NUMBA:
+            buf = numpy.asarray(image).copy()
+            self.kernel(buf, self.threshold_matrix)
+            return Image.fromarray(buf, 'L')
+        # Without Numba, the kernel runs as plain Python -- which is
+        # slower still than this, the original loop over the image:
+        threshold_matrix = self.threshold_matrix.tolist()
         for y in range(image.size[1]):
             for x in range(image.size[0]):
                 old = image.getpixel((x, y))
-                new = self.threshold_matrix[old]
+                new = threshold_matrix[old]
                 err = (old - new) >> 3 # divide by 8.
                 image.putpixel((x, y), new)
                 for nxy in [(x+1, y),
@@ -72,7 +85,7 @@ class SlowFloydSteinberg(ThresholdProcessor):
         for y in range(image.size[1]):
             for x in range(image.size[0]):
                 old = image.getpixel((x, y))
-                new = self.threshold_matrix[old]
+                new = int(self.threshold_matrix[old])
                 image.putpixel((x, y), new)
                 err = old - new
                 for nxy in [((x+1, y),      SEVEN_FRAC),
@@ -124,6 +137,8 @@ class CMYKAtkinson(Processor):
         self.overprinter = pipeline.BandFork(Atkinson, mode='CMYK')
     
     def process(self, image):
+        if not self.gcr:
+            return self.overprinter.process(image)
         return pipeline.Pipe(gcr.BasicGCR(self.gcr),
                                           self.overprinter).process(image)
 
@@ -140,6 +155,8 @@ class CMYKFloydsterBill(Processor):
         self.overprinter.update({ 'C' : SlowFloydSteinberg() })
     
     def process(self, image):
+        if not self.gcr:
+            return self.overprinter.process(image)
         return pipeline.Pipe(gcr.BasicGCR(self.gcr),
                                           self.overprinter).process(image)
 
@@ -221,7 +238,8 @@ class CMYKDotScreen(Processor):
     
     @property
     def gcr_percentage(self):
-        return self.overprinter.basicgcr.percentage
+        basicgcr = self.overprinter.basicgcr
+        return basicgcr and basicgcr.percentage or 0
     
     def angle(self, band_label):
         if band_label not in self.overprinter.band_labels:
@@ -1,8 +1,13 @@
 #!/usr/bin/env python
 # encoding: utf-8
 from __future__ import print_function
+from collections import OrderedDict
 from math import fabs, pow as mpow
 
+import hashlib
+import os
+import threading
+
 from instakit.utils.mode import Mode
 from instakit.abc import Processor
 from instakit.exporting import Exporter
@@ -12,6 +17,15 @@ export = exporter.decorator()
 
 PERCENT_ADMONISHMENT = "Do you not know how percents work??!"
 
+# An LRU cache of BasicGCR results, keyed by GCR parameters and a digest of
+# the input image data -- “gcr(…)” visits every pixel in Python, so hashing
+# the input is cheap by comparison. Each entry is a full-size CMYK image, so
+# the cache is disabled by default; set INSTAKIT_GCR_CACHE to the number of
+# entries to keep:
+gcr_cache = OrderedDict()
+gcr_cache_lock = threading.Lock()
+gcr_cache_size = int(os.environ.get('INSTAKIT_GCR_CACHE', 0))
+
 @export
 def gcr(image, percentage=20, revert_mode=False):
     ''' basic “Gray Component Replacement” function. Returns a CMYK image* with 
@@ -71,8 +85,27 @@ class BasicGCR(Processor):
         self.revert_mode = revert_mode
     
     def process(self, image):
-        return gcr(image, percentage=self.percentage,
-                          revert_mode=self.revert_mode)
+        if not gcr_cache_size:
+            return gcr(image, percentage=self.percentage,
+                              revert_mode=self.revert_mode)
+        # N.B. the palette and transparency aren’t part of the image bytes,
+        # but do determine the colors of palette-mode images:
+        palette = image.getpalette()
+        key = (self.percentage, self.revert_mode, image.mode, image.size,
+               palette and tuple(palette), image.info.get('transparency'),
+               hashlib.blake2b(image.tobytes(), digest_size=16).digest())
+        with gcr_cache_lock:
+            cached = gcr_cache.get(key)
+            if cached is not None:
+                gcr_cache.move_to_end(key)
+                return cached.copy()
+        output = gcr(image, percentage=self.percentage,
+                            revert_mode=self.revert_mode)
+        with gcr_cache_lock:
+            gcr_cache[key] = output.copy()
+            while len(gcr_cache) > gcr_cache_size:
+                gcr_cache.popitem(last=False)
+        return output
 
 @export
 def hex2rgb(h):
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+jit.py
+
+Compiled `numpy.ndarray` kernels for instakit processors, built with Numba
+when it is available. Numba is an optional dependency -- install it with
+`pip install instakit[numba]` -- and if it can’t be imported, `njit` degrades
+to a no-op decorator and the kernels run as plain Python over the array
+data: slowly, but correctly. Processors check `HAS_NUMBA` and keep to their
+own, faster pure-Python code paths in that case.
+
+The serial kernel is declared with an explicit signature, so it is compiled
+when this module is imported rather than on first call; the parallel,
+multi-band drivers are compiled lazily -- compiling them would start up
+Numba’s threading layer, which can leave any process that forks after
+importing this module hung at exit. Compiled kernels are cached on disk,
+by default beneath `~/.cache/instakit/numba` (set `NUMBA_CACHE_DIR` to
+override). N.B. the drivers call their dither kernel directly, rather than
+taking it as an argument -- the type of a dispatcher argument is unique to
+each process, so drivers taking one would never be found in the cache.
+"""
+from __future__ import print_function
+
+import numpy
+import os
+
+from instakit.exporting import Exporter
+
+exporter = Exporter(path=__file__)
+export = exporter.decorator()
+
+# N.B. this has to be set before Numba is first imported:
+os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join(os.path.expanduser('~'),
+                                                      '.cache', 'instakit', 'numba'))
+
+try:
+    from numba import njit, prange
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """ Stand-in for `numba.njit(…)` -- returns the function unchanged """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+else:
+    HAS_NUMBA = True
+
+@export
+@njit('void(uint8[:, :], uint8[::1])', cache=True, boundscheck=False)
+def atkinson_diffuse(buf, thresh):
+    """ Atkinson-dither a rank-2 ``uint8`` array in place, using `thresh`
+        -- a 256-entry ``uint8`` threshold matrix -- to quantize each pixel,
+        and diffusing ⅛ of the quantization error to each of six neighbors.
+    """
+    # N.B. the arithmetic is done in explicitly signed integers --
+    # Numba types “int(…)” of a ``uint8`` as unsigned, which would
+    # wrap every negative error around to a huge positive one:
+    height, width = buf.shape
+    for y in range(height):
+        for x in range(width):
+            old = numpy.int64(buf[y, x])
+            new = numpy.int64(thresh[old])
+            err = (old - new) >> 3 # divide by 8.
+            buf[y, x] = new
+            for nx, ny in ((x + 1, y),
+                           (x + 2, y),
+                           (x - 1, y + 1),
+                           (x,     y + 1),
+                           (x + 1, y + 1),
+                           (x,     y + 2)):
+                if 0 <= nx < width and 0 <= ny < height:
+                    px = numpy.int64(buf[ny, nx]) + err
+                    buf[ny, nx] = min(max(px, 0), 255)
+
+@export
+@njit(parallel=True, cache=True)
+def run_bands(arr, thresholds):
+    """ Atkinson-dither (q.v. `atkinson_diffuse(…)` supra.) each band of a rank-3
+        ``uint8`` array in place, one band per thread -- the bands are independent,
+        so they can be dithered concurrently. Each row of `thresholds` is the
+        threshold matrix for the corresponding band.
+    """
+    for c in prange(arr.shape[2]):
+        atkinson_diffuse(arr[:, :, c], thresholds[c])
+
+@export
+@njit(parallel=True, cache=True)
+def overprint(arr, thresholds, luts):
+    """ Atkinson-dither each band of a rank-3 ``uint8`` array in place, as per
+       `run_bands(…)` supra., then colorize every band through its 256×3 lookup
+        table in `luts` and multiply-composite the results -- all within a single
+        sweep over the dithered data, returning the composited H×W×3 ``uint8`` array.
+    """
+    height, width, count = arr.shape
+    for c in prange(count):
+        atkinson_diffuse(arr[:, :, c], thresholds[c])
+    out = numpy.empty((height, width, 3), dtype=numpy.uint8)
+    for y in prange(height):
+        for x in range(width):
+            for z in range(3):
+                acc = numpy.int64(255)
+                for c in range(count):
+                    acc = (acc * numpy.int64(luts[c, arr[y, x, c], z])) // 255
+                out[y, x, z] = acc
+    return out
+
+export(HAS_NUMBA,   name='HAS_NUMBA')
+
+# Assign the modules’ `__all__` and `__dir__` using the exporter:
+__all__, __dir__ = exporter.all_and_dir()
@@ -58,6 +58,12 @@ class ModeAncestor(AliasingEnum):
     @classmethod
     def is_mode(cls, instance):
         return type(instance) in cls.__mro__
+    
+    def __reduce_ex__(self, protocol):
+        """ Pickle members by name -- their values, PIL mode descriptors,
+            won’t compare equal to the originals once unpickled
+        """
+        return getattr, (type(self), self.name)
 
 class ModeContext(contextlib.AbstractContextManager):
     
@@ -1,30 +1,188 @@
 # encoding: utf-8
 from __future__ import print_function
 
-from PIL import ImageOps, ImageChops
+import hashlib
+import numpy
+import os
+import threading
+from PIL import Image
 from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from copy import copy
 from enum import unique
-from functools import wraps
+from functools import cached_property, lru_cache, wraps
+from queue import Empty, Full, Queue
 
 from clu.enums import AliasingEnum, alias
-from clu.mathematics import Σ
-from clu.predicates import tuplize
-from clu.typology import string_types
+from clu.predicates import slots_for, tuplize
 
 from instakit.abc import Fork, NOOp, Sequence, MutableSequence
 from instakit.utils.gcr import BasicGCR
+from instakit.utils.jit import atkinson_diffuse, run_bands, overprint, HAS_NUMBA
 from instakit.utils.mode import Mode
-from instakit.processors.adjust import AutoContrast
+from instakit.utils.ndarrays import NDProcessor, fromimage, toimage
 from instakit.exporting import Exporter
 
 exporter = Exporter(path=__file__)
 export = exporter.decorator()
 
+# Marks the band pool’s own worker threads (q.v. “in_band_pool()” sub.):
+band_pool_thread = threading.local()
+
+def mark_band_pool_thread():
+    band_pool_thread.active = True
+
+def in_band_pool():
+    """ True if the calling thread is one of the band pool’s workers -- in which
+        case a nested fork must process its bands serially, as waiting on the
+        pool from within the pool can deadlock once all its workers are busy
+    """
+    return getattr(band_pool_thread, 'active', False)
+
+# Shared across all BandFork instances -- sized, by default, for the
+# four bands of a CMYK image (set INSTAKIT_BAND_THREADS to override):
+band_pool = ThreadPoolExecutor(max_workers=int(os.environ.get('INSTAKIT_BAND_THREADS', 4)),
+                               initializer=mark_band_pool_thread)
+
+# Held by whichever thread is running one of the parallel compiled
+# drivers (q.v. “parallel_region(…)” sub.):
+parallel_lock = threading.Lock()
+
+@contextmanager
+def parallel_region(serial=False):
+    """ Yield True if the calling thread may run one of the parallel compiled
+        drivers (e.g. `instakit.utils.jit.run_bands(…)`), or False if it should
+        do the work serially, in the calling thread -- as it must if `serial`
+        is set, if it’s a band-pool thread, or if another thread is already
+        running a parallel driver: some of Numba’s threading layers abort the
+        process if parallel regions are entered from several threads at once
+    """
+    if serial or in_band_pool() or not parallel_lock.acquire(blocking=False):
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        parallel_lock.release()
+
+def dither_bands(arr, thresholds, serial=False):
+    """ Atkinson-dither each band of a rank-3 ``uint8`` array in place, with the
+        threshold matrix in the corresponding row of `thresholds` -- all at once,
+        in parallel, where possible (q.v. “parallel_region(…)” supra.)
+    """
+    with parallel_region(serial) as parallel:
+        if parallel:
+            run_bands(arr, thresholds)
+            return
+    for idx in range(arr.shape[2]):
+        atkinson_diffuse(arr[:, :, idx], thresholds[idx])
+
 if not hasattr(__builtins__, 'cmp'):
     def cmp(a, b):
         return (a > b) - (a < b)
 
+def process_channel(processor, image, idx):
+    """ Process one channel of an image, extracted with `Image.getchannel(…)`
+        -- which, unlike `Image.split()`, leaves the other channels be
+    """
+    return processor.process(image.getchannel(idx))
+
+def process_stages(stages, image, idx):
+    """ Process one channel of an image, as per “process_channel(…)” supra.,
+        through a sequence of processors in turn
+    """
+    band = image.getchannel(idx)
+    for processor in stages:
+        band = processor.process(band)
+    return band
+
+@lru_cache(maxsize=None)
+def mode_for_string(string):
+    """ A memoized “Mode.for_string(…)” -- which, uncached, searches
+        through the members of the Mode enum anew on every call
+    """
+    return Mode.for_string(string)
+
+def chain_processes(processes):
+    """ Return a single callable that applies each of the given callables in
+        turn -- as straight-line code for chains of up to four, so that the
+        interpreter doesn’t have to loop over them for every image
+    """
+    count = len(processes)
+    if count == 0:
+        return lambda image: image
+    if count == 1:
+        p0, = processes
+        return p0
+    if count == 2:
+        p0, p1 = processes
+        return lambda image: p1(p0(image))
+    if count == 3:
+        p0, p1, p2 = processes
+        return lambda image: p2(p1(p0(image)))
+    if count == 4:
+        p0, p1, p2, p3 = processes
+        return lambda image: p3(p2(p1(p0(image))))
+    def chained(image):
+        for process in processes:
+            image = process(image)
+        return image
+    return chained
+
+def slot_state(instance, *transients):
+    """ Return a dict of an instance’s slot values, sans any of the named
+        `transients` -- e.g. cached closures, which can be neither pickled
+        nor meaningfully deep-copied -- for use in “__getstate__()”
+    """
+    return { slot : getattr(instance, slot) for slot in slots_for(type(instance))
+                                             if slot != '__weakref__'
+                                            and slot not in transients
+                                            and hasattr(instance, slot) }
+
+def defining_class(cls, name):
+    """ Return the class, from the MRO of `cls`, whose namespace defines `name` """
+    for ancestor in cls.__mro__:
+        if name in vars(ancestor):
+            return ancestor
+    return None
+
+def round_trips(ndimage):
+    """ True if the stock ndarray » PIL » ndarray round-trip (q.v. “toimage(…)”
+        and “fromimage(…)”) would hand back the array unchanged -- i.e. it is
+        writable, of dtype ``uint8``, and either rank-2 or channels-last
+    """
+    if ndimage.dtype != numpy.uint8 or not ndimage.flags.writeable:
+        return False
+    if ndimage.ndim == 2:
+        return True
+    if ndimage.ndim != 3:
+        return False
+    channels = 3 if 3 in ndimage.shape else 4
+    return channels in ndimage.shape and ndimage.shape.index(channels) == 2
+
+def nd_stage(process_nd):
+    """ Wrap a “process_nd(…)” callable, for use as an inner stage of a fused
+        chain, such that any result that the ndarray » PIL » ndarray round-trip
+        would alter -- e.g. float data, which “toimage(…)” byte-scales -- goes
+        through that round-trip, as it would between unfused stages
+    """
+    @wraps(process_nd)
+    def processed(ndimage):
+        out = process_nd(ndimage)
+        if round_trips(out):
+            return out
+        return fromimage(toimage(out))
+    return processed
+
+def is_nd_stage(processor):
+    """ True if the processor is an NDProcessor whose “process(…)” call
+        is nothing more than the stock PIL » ndarray » PIL round-trip
+        around its “process_nd(…)” method
+    """
+    return isinstance(processor, NDProcessor) and \
+              type(processor).process is NDProcessor.process
+
 @export
 class Pipe(Sequence):
     
@@ -32,7 +190,7 @@ class Pipe(Sequence):
         Derived from a `pilkit` class:
             `pilkit.processors.base.ProcessorPipeline`
     """
-    __slots__ = tuplize('tuple')
+    __slots__ = ('tuple', 'chain')
     
     @classmethod
     def base_type(cls):
@@ -41,6 +199,7 @@ class Pipe(Sequence):
     @wraps(tuple.__init__)
     def __init__(self, *args):
         self.tuple = tuplize(*args)
+        self.chain = None
     
     def iterate(self):
         yield from self.tuple
@@ -67,9 +226,20 @@ class Pipe(Sequence):
         return self.tuple[-1]
     
     def process(self, image):
-        for processor in self.iterate():
-            image = processor.process(image)
-        return image
+        # Chained lazily, on first use:
+        chain = self.chain
+        if chain is None:
+            chain = self.chain = chain_processes(tuple(processor.process for processor in self.tuple
+                                                                         if not isinstance(processor, NOOp)))
+        return chain(image)
+    
+    def __getstate__(self):
+        return slot_state(self, 'chain')
+    
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self.chain = None
     
     def __eq__(self, other):
         if not isinstance(other, (type(self), type(self).base_type())):
@@ -83,7 +253,7 @@ class Pipeline(MutableSequence):
         Derived from a `pilkit` class:
             `pilkit.processors.base.ProcessorPipeline`
     """
-    __slots__ = tuplize('list')
+    __slots__ = ('list', 'chain')
     
     @classmethod
     def base_type(cls):
@@ -112,6 +282,7 @@ class Pipeline(MutableSequence):
                 self.list = base_type([target])
         else:
             self.list = base_type([*args])
+        self.chain = None
     
     def iterate(self):
         yield from self.list
@@ -130,13 +301,15 @@ class Pipeline(MutableSequence):
     
     @wraps(list.__setitem__)
     def __setitem__(self, idx, value):
-        if value in (None, NOOp):
+        if value is None or value is NOOp:
             value = NOOp()
         self.list[idx] = value
+        self.chain = None
     
     @wraps(list.__delitem__)
     def __delitem__(self, idx):
         del self.list[idx]
+        self.chain = None
     
     @wraps(list.index)
     def index(self, value):
@@ -145,10 +318,12 @@ class Pipeline(MutableSequence):
     @wraps(list.append)
     def append(self, value):
         self.list.append(value)
+        self.chain = None
     
     @wraps(list.extend)
     def extend(self, iterable):
         self.list.extend(iterable)
+        self.chain = None
     
     def pop(self, idx=-1):
         """ Remove and return item at `idx` (default last).
@@ -156,22 +331,90 @@ class Pipeline(MutableSequence):
             See list.pop(…) for details.
         """
         self.list.pop(idx)
+        self.chain = None
     
     def last(self):
         if not bool(self):
             raise IndexError("pipe is empty")
         return self.list[-1]
     
+    def freeze(self):
+        """ Return a FrozenPipeline of the processors in this pipeline """
+        return FrozenPipeline(self)
+    
+    def bind_processes(self):
+        """ Return a tuple of the callables, applied in turn, that make up
+            this pipeline -- normally the processors’ bound “process(…)”
+            methods, but if every stage works on ndarrays, the image data
+            is converted once on the way in and once on the way out, rather
+            than at every stage. Between stages, any data that the conversion
+            would have altered -- e.g. non-``uint8`` data, which is byte-scaled
+            -- is still converted (q.v. “nd_stage(…)” supra.) so the output
+            is the same either way. NOOp stages are left out altogether.
+        """
+        stages = [processor for processor in self.list if not isinstance(processor, NOOp)]
+        if stages and all(is_nd_stage(processor) for processor in stages):
+            return (fromimage, *(nd_stage(processor.process_nd) for processor in stages[:-1]),
+                                                                stages[-1].process_nd, toimage)
+        return tuple(processor.process for processor in stages)
+    
     def process(self, image):
-        for processor in self.iterate():
-            image = processor.process(image)
-        return image
+        # Chained lazily, and rechained only after the pipeline has changed:
+        chain = self.chain
+        if chain is None:
+            chain = self.chain = chain_processes(self.bind_processes())
+        return chain(image)
+    
+    def __getstate__(self):
+        return slot_state(self, 'chain')
+    
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self.chain = None
     
     def __eq__(self, other):
         if not isinstance(other, (type(self), type(self).base_type())):
             return NotImplemented
         return super(Pipe, self).__eq__(other)
 
+@export
+class FrozenPipeline(Pipeline):
+    
+    """ An immutable, tuple-backed Pipeline -- for pipelines that are built
+        once and then applied to many images. The processors’ “process(…)”
+        methods are bound up front, rather than on first use (or, if the
+        pipeline was unpickled or copied, on its first use after that) and
+        never need rebinding.
+    """
+    __slots__ = tuple()
+    
+    @classmethod
+    def base_type(cls):
+        return tuple
+    
+    def __init__(self, *args):
+        super(FrozenPipeline, self).__init__(*args)
+        self.chain = chain_processes(self.bind_processes())
+    
+    def __setitem__(self, idx, value):
+        raise TypeError("FrozenPipeline is immutable")
+    
+    def __delitem__(self, idx):
+        raise TypeError("FrozenPipeline is immutable")
+    
+    def append(self, value):
+        raise TypeError("FrozenPipeline is immutable")
+    
+    def extend(self, iterable):
+        raise TypeError("FrozenPipeline is immutable")
+    
+    def pop(self, idx=-1):
+        raise TypeError("FrozenPipeline is immutable")
+    
+    def freeze(self):
+        return self
+
 @export
 class BandFork(Fork):
     
@@ -207,7 +450,7 @@ class BandFork(Fork):
         ‡ q.v. the `collections.abc` module, and the `MutableMapping`
                     abstract base class within, supra.
     """
-    __slots__ = tuplize('mode_t')
+    __slots__ = ('mode_t', 'band_labels_t', 'band_index', 'band_list', 'active_bands', 'sealed')
     
     def __init__(self, processor_factory, *args, **kwargs):
         """ Initialize a BandFork instance, using the given callable value
@@ -219,7 +462,60 @@ class BandFork(Fork):
         
         # Reset `self.mode_t` if a new mode was specified --
         # N.B. we can’t use the “self.mode” property during “__init__(…)”:
-        self.mode_t = kwargs.pop('mode', Mode.RGB)
+        mode = kwargs.pop('mode', Mode.RGB)
+        if isinstance(mode, str):
+            mode = mode_for_string(mode)
+        self.mode_t = mode
+        self.index_bands()
+    
+    def index_bands(self):
+        """ Rebuild the positional band-processor list -- `self.band_list`,
+            indexed by channel number, per the current mode -- from the
+            band-processor dictionary. The dictionary remains the canonical
+            store; the list lets “iterate()” and band lookups skip hashing.
+            The mode’s band labels are also stashed, as `self.band_labels_t`.
+        """
+        self.band_labels_t = band_labels = tuple(self.mode_t.bands)
+        self.band_index = { band_label : idx for idx, band_label in enumerate(band_labels) }
+        self.band_list = [self.dict[band_label] for band_label in band_labels]
+        self.index_active_bands()
+        self.sealed = None
+    
+    def index_active_bands(self):
+        """ Rebuild `self.active_bands` -- the (index, processor) pairs
+            of those bands whose processor isn’t a NOOp
+        """
+        self.active_bands = tuple((idx, processor) for idx, processor in enumerate(self.band_list)
+                                                    if not isinstance(processor, NOOp))
+    
+    def __getitem__(self, idx):
+        """ Get the processor for a band label, from the positional band list """
+        if idx in self.band_index:
+            return self.band_list[self.band_index[idx]]
+        return super(BandFork, self).__getitem__(idx)
+    
+    def __setitem__(self, idx, value):
+        """ Set the processor for a band label, in both the dictionary
+            and the positional band list
+        """
+        super(BandFork, self).__setitem__(idx, value)
+        if idx in self.band_index:
+            self.band_list[self.band_index[idx]] = self.dict[idx]
+            self.index_active_bands()
+            self.sealed = None
+    
+    def __delitem__(self, idx):
+        super(BandFork, self).__delitem__(idx)
+        self.index_bands()
+    
+    def pop(self, idx, default_value=None):
+        out = super(BandFork, self).pop(idx, default_value)
+        self.index_bands()
+        return out
+    
+    def update(self, iterable=None, **kwargs):
+        super(BandFork, self).update(iterable, **kwargs)
+        self.index_bands()
     
     @property
     def mode(self):
@@ -229,36 +525,248 @@ class BandFork(Fork):
     def mode(self, value):
         if value is None:
             return
-        if type(value) in string_types:
-            value = Mode.for_string(value)
+        if isinstance(value, str):
+            value = mode_for_string(value)
+        if value is self.mode_t:
+            return
         if Mode.is_mode(value):
-            # if value is not self.mode_t:
             self.set_mode_t(value)
         else:
             raise TypeError("invalid mode type: %s (%s)" % (type(value), value))
     
     def set_mode_t(self, value):
         self.mode_t = value # DOUBLE SHADOW!!
+        self.index_bands()
     
     @property
     def band_labels(self):
-        return self.mode.bands
+        return self.band_labels_t
     
     def iterate(self):
-        yield from (self[band_label] for band_label in self.band_labels)
+        return iter(self.band_list)
+    
+    def convert(self, image):
+        """ Return the image in the fork’s mode, skipping the mode-processing
+            call entirely if the image is in that mode already
+        """
+        if image.mode == self.mode.to_string():
+            return image
+        return self.mode.process(image)
     
     def split(self, image):
-        return self.mode.process(image).split()
+        return self.convert(image).split()
+    
+    def split_nd(self, image):
+        """ Return the image data as a single H×W×C `numpy.ndarray` -- a view
+            on the converted image, from which bands can be sliced without
+            allocating or copying anything per band
+        """
+        return numpy.asarray(self.convert(image))
     
     def compose(self, *bands):
         return self.mode.merge(*bands)
     
-    def process(self, image):
-        processed = []
-        for processor, band in zip(self.iterate(),
-                                   self.split(image)):
-            processed.append(processor.process(band))
-        return self.compose(*processed)
+    def band_kernel(self, processors):
+        """ Return the compiled kernel shared by all of the given band processors,
+            or None if they don’t all furnish the same one (q.v. the `kernel`
+            attribute of `instakit.processors.halftone.SlowAtkinson` sub.) --
+            or if it isn’t the kernel that the multi-band drivers are compiled
+            to run, i.e. `instakit.utils.jit.atkinson_diffuse(…)`, or if any of
+            the processors overrides the “process(…)” method that goes with it
+        """
+        if not HAS_NUMBA:
+            return None
+        kernels = { getattr(processor, 'kernel', None) for processor in processors }
+        if len(kernels) != 1:
+            return None
+        kernel = kernels.pop()
+        if kernel is not atkinson_diffuse:
+            return None
+        if not all(hasattr(processor, 'threshold_matrix') for processor in processors):
+            return None
+        if not all(defining_class(type(processor), 'process') is \
+                   defining_class(type(processor), 'kernel') for processor in processors):
+            return None
+        return kernel
+    
+    def dispatch(self):
+        """ Work out, from the band processors, how images are to be processed
+            -- returning a callable, with the signature of “process(…)” sub.,
+            that processes them accordingly
+        """
+        processors = tuple(self.iterate())
+        kernel = self.band_kernel(processors)
+        if kernel is not None:
+            # All bands run the same compiled kernel: process them
+            # in one parallel sweep over a single H×W×C ndarray:
+            thresholds = numpy.stack([processor.threshold_matrix
+                                      for processor in processors])
+            mode_string = self.mode.to_string()
+            
+            def process_kernel(image, serial=False):
+                arr = self.split_nd(image).copy()
+                if arr.ndim != 3:
+                    return self.process_bands(image, serial=serial)
+                dither_bands(arr, thresholds, serial=serial)
+                return Image.fromarray(arr, mode_string)
+            
+            return process_kernel
+        
+        if all(is_nd_stage(processor) for processor in processors):
+            # All bands are processed as ndarrays: hand each one
+            # its slice of the image data, sans PIL band images:
+            process_nds = tuple(processor.process_nd for processor in processors)
+            
+            def process_nd(image, serial=False):
+                arr = self.split_nd(image)
+                if arr.ndim != 3:
+                    return self.process_bands(image, serial=serial)
+                # N.B. the image data is read-only and interleaved; copy it
+                # once, band-major, so each band is handed a writable and
+                # contiguous array -- as it would get from “fromimage(…)”:
+                planes = numpy.ascontiguousarray(arr.transpose(2, 0, 1))
+                return self.compose(*(toimage(process_nd(planes[idx]))
+                                      for idx, process_nd in enumerate(process_nds)))
+            
+            return process_nd
+        
+        return self.process_bands
+    
+    def seal(self):
+        """ Resolve how images are to be processed (q.v. “dispatch(…)” supra.)
+            once and for all, rather than on every call to “process(…)” --
+            returning the fork itself, for chaining. Changing the fork’s band
+            processors unseals it; changing the band processors themselves
+            (e.g. appending a stage to a band’s pipeline) does not, so the
+            fork must be resealed after doing so.
+        """
+        self.sealed = self.dispatch()
+        return self
+    
+    def process(self, image, serial=False):
+        """ Process each band of the image with its processor, and compose
+            the results. Bands are processed concurrently, in the module’s
+            shared thread pool -- pass `serial=True` to process them one by
+            one in the calling thread instead, e.g. when the caller is itself
+            running in a pool.
+        """
+        sealed = self.sealed
+        if sealed is None:
+            sealed = self.dispatch()
+        return sealed(image, serial=serial)
+    
+    def __getstate__(self):
+        # N.B. sealed forks come back unsealed:
+        return slot_state(self, 'sealed')
+    
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self.sealed = None
+    
+    def process_bands(self, image, serial=False):
+        """ Process each band of the image as a PIL image, with its processor
+           -- as per “process(…)” supra., to which this is the fallback
+        """
+        # Bands with NOOp processors are passed through as-is:
+        active = self.active_bands
+        if serial or len(active) < 2 or in_band_pool():
+            bands = list(self.split(image))
+            for idx, processor in active:
+                bands[idx] = processor.process(bands[idx])
+            return self.compose(*bands)
+        # Bands are independent -- and PIL releases the GIL
+        # inside its C code -- so process them in threads,
+        # each of which extracts only its own channel. N.B. the
+        # converted image may well be the input image itself, and
+        # lazily loaded from a file -- so load it here, once, lest
+        # the worker threads all try to load it at the same time:
+        converted = self.convert(image)
+        converted.load()
+        futures = { idx : band_pool.submit(process_channel, processor, converted, idx) for idx, processor in active }
+        return self.compose(*[futures[idx].result() if idx in futures else converted.getchannel(idx)
+                                                                      for idx in range(len(self.band_list))])
+    
+    def process_stream(self, images):
+        """ Process an iterable of images, yielding each output image in turn.
+            
+            The work is split into two stages, each running in its own thread
+            and connected by bounded queues: the first splits each image and
+            runs every band through all but the last of its processing stages
+            (e.g. a ditherer), while the second runs the last stage of each
+            band (e.g. an ink) and composes the result -- so that the second
+            stage works on one image whilst the first works on the next.
+        """
+        heads, tails = [], []
+        for processor in self.band_list:
+            stages = tuple(processor.iterate()) if hasattr(processor, 'iterate') else (processor,)
+            heads.append(stages[:-1] if len(stages) > 1 else stages)
+            tails.append(stages[-1:] if len(stages) > 1 else tuple())
+        
+        done = object()
+        stopped = threading.Event()
+        split_queue, compose_queue = Queue(maxsize=2), Queue(maxsize=2)
+        
+        def put(queue, item):
+            while not stopped.is_set():
+                try:
+                    queue.put(item, timeout=0.1)
+                except Full:
+                    continue
+                return
+        
+        def get(queue):
+            while not stopped.is_set():
+                try:
+                    return queue.get(timeout=0.1)
+                except Empty:
+                    continue
+            return done
+        
+        def run_heads():
+            try:
+                for image in images:
+                    if stopped.is_set():
+                        return
+                    bands = list(self.split(image))
+                    for idx, stages in enumerate(heads):
+                        for processor in stages:
+                            bands[idx] = processor.process(bands[idx])
+                    put(split_queue, bands)
+            except BaseException as exc:
+                put(split_queue, exc)
+            else:
+                put(split_queue, done)
+        
+        def run_tails():
+            while True:
+                bands = get(split_queue)
+                if bands is done or isinstance(bands, BaseException):
+                    put(compose_queue, bands)
+                    return
+                try:
+                    for idx, stages in enumerate(tails):
+                        for processor in stages:
+                            bands[idx] = processor.process(bands[idx])
+                    put(compose_queue, self.compose(*bands))
+                except BaseException as exc:
+                    put(compose_queue, exc)
+                    return
+        
+        workers = (threading.Thread(target=run_heads, daemon=True),
+                   threading.Thread(target=run_tails, daemon=True))
+        for worker in workers:
+            worker.start()
+        try:
+            while True:
+                result = compose_queue.get()
+                if result is done:
+                    return
+                if isinstance(result, BaseException):
+                    raise result
+                yield result
+        finally:
+            stopped.set()
 
 ChannelFork = BandFork
 
@@ -273,16 +781,59 @@ ink_values = (
     (0,   0,   255),    # Blue
 )
 
+# An LRU cache of colorized bands, keyed by ink and band-data digest -- for
+# sessions that re-apply the same inks to unchanged images. Hashing a band
+# costs roughly half as much as colorizing it, so this only pays off when
+# bands recur; set INSTAKIT_INK_CACHE to the number of entries to keep:
+ink_cache = OrderedDict()
+ink_cache_lock = threading.Lock()
+ink_cache_size = int(os.environ.get('INSTAKIT_INK_CACHE', 0))
+
 class Ink(AliasingEnum):
     
     def rgb(self):
         return ink_values[self.value]
     
+    @cached_property
+    def lut(self):
+        """ A 256×3 ``uint8`` lookup table, mapping grayscale values to the
+            same gradient -- from white paper to this ink -- as furnished by
+            `ImageOps.colorize(…)`
+        """
+        black = numpy.array(type(self)(0).rgb(), dtype=numpy.int32)
+        white = numpy.array(self.rgb(),          dtype=numpy.int32)
+        ramp = numpy.arange(256, dtype=numpy.int32)[:, numpy.newaxis]
+        return (black + ramp * (white - black) // 255).astype(numpy.uint8)
+    
+    def colorize(self, band):
+        """ Colorize a rank-2 ``uint8`` array through the ink’s lookup table,
+            returning a rank-3 array -- from the ink cache (q.v. “ink_cache”
+            supra.) if it is enabled and has seen this band before
+        """
+        if not ink_cache_size:
+            # N.B. “numpy.take(…)” gathers whole LUT rows considerably
+            # faster than the equivalent fancy-indexing expression:
+            return numpy.take(self.lut, band, axis=0)
+        band = numpy.ascontiguousarray(band)
+        key = (self.value, band.shape, hashlib.blake2b(band, digest_size=16).digest())
+        with ink_cache_lock:
+            colorized = ink_cache.get(key)
+            if colorized is not None:
+                ink_cache.move_to_end(key)
+                return colorized
+        colorized = numpy.take(self.lut, band, axis=0)
+        colorized.flags.writeable = False
+        with ink_cache_lock:
+            ink_cache[key] = colorized
+            while len(ink_cache) > ink_cache_size:
+                ink_cache.popitem(last=False)
+        return colorized
+    
     def process(self, image):
-        InkType = type(self)
-        return ImageOps.colorize(Mode.L.process(image),
-                                 InkType(0).rgb(),
-                                 InkType(self.value).rgb())
+        # Bands arriving from a dithering stage are already in 'L' mode:
+        if image.mode != 'L':
+            image = Mode.L.process(image)
+        return Image.fromarray(self.colorize(numpy.asarray(image)), 'RGB')
 
 @unique
 class CMYKInk(Ink):
@@ -335,18 +886,22 @@ class OverprintFork(BandFork):
         color model -- q.v. the CMYKInk enum processor supra. and the related
         PIL/Pillow module function `ImageOps.colorize(…)` supra.
     """
-    __slots__ = ('contrast', 'basicgcr')
+    __slots__ = tuplize('basicgcr')
     
     inks = CMYKInk.CMYK()
     
+    # OverprintFork is always in CMYK mode (q.v. “set_mode_t(…)” sub.)
+    # so its band labels can be class-level, like its inks:
+    band_labels = Mode.CMYK.bands
+    
     def __init__(self, processor_factory, gcr=20, *args, **kwargs):
         """ Initialize an OverprintFork instance with the given callable value
             for `processor_factory` and any band-appropriate keyword-arguments,
             e.g. `(C=MyProcessor, M=MyOtherProcessor, Y=MyProcessor, K=None)`
         """
-        # Store BasicGCR and AutoContrast processors:
-        self.contrast = AutoContrast()
-        self.basicgcr = BasicGCR(percentage=gcr)
+        # Store a BasicGCR processor --
+        # N.B. a `gcr` value of zero (or None) disables GCR:
+        self.basicgcr = gcr and BasicGCR(percentage=gcr) or None
         
         # Call `super(…)`, passing `processor_factory`:
         super(OverprintFork, self).__init__(processor_factory, *args, mode=Mode.CMYK,
@@ -362,15 +917,15 @@ class OverprintFork(BandFork):
             to the band in question. Calling it multiple times *should*
             be idempotent (but don’t quote me on that)
         """
-        for band_label, ink in zip(self.band_labels,
-                              type(self).inks):
-            processor = self[band_label]
+        for band_label, processor, ink in zip(self.band_labels,
+                                              self.band_list,
+                                              self.inks):
             if processor is None:
                 self[band_label] = Pipe(ink)
             elif hasattr(processor, 'append'):
+                # N.B. appending in place leaves the band’s entry as-is:
                 if processor[-1] is not ink:
                     processor.append(ink)
-                    self[band_label] = processor
             elif hasattr(processor, 'last'):
                 if processor.last() is not ink:
                     self[band_label] = Pipe(*processor.iterate(), ink)
@@ -392,18 +947,124 @@ class OverprintFork(BandFork):
         super(OverprintFork, self).update(iterable, **kwargs)
         self.apply_CMYK_inks()
     
-    def split(self, image):
-        """ OverprintFork.split(image) uses imagekit.utils.gcr.BasicGCR(…) to perform
-            gray-component replacement in CMYK-mode images; for more information,
-            see the imagekit.utils.gcr module
+    def ink_stages(self):
+        """ If every band is processed by a pipeline ending in an ink, return
+            a (stages, inks) tuple -- the stages preceding each band’s ink, and
+            the inks themselves; otherwise return None.
+        """
+        stages, inks = [], []
+        for processor in self.iterate():
+            band_stages = tuple(processor.iterate()) if hasattr(processor, 'iterate') else ()
+            if not band_stages or not isinstance(band_stages[-1], Ink):
+                return None
+            stages.append(band_stages[:-1])
+            inks.append(band_stages[-1])
+        return stages, inks
+    
+    def fused_stages(self):
+        """ If every band is processed by a pipeline of exactly two stages
+           -- a processor furnishing a compiled kernel (q.v. “band_kernel(…)”
+            supra.) followed by its ink -- return a (thresholds, luts) tuple
+            with which the whole fork can be run as a single fused kernel;
+            otherwise return None.
+        """
+        inked = self.ink_stages()
+        if inked is None:
+            return None
+        stages, inks = inked
+        if any(len(band_stages) != 1 for band_stages in stages):
+            return None
+        ditherers = [band_stages[0] for band_stages in stages]
+        if self.band_kernel(ditherers) is None:
+            return None
+        return (numpy.stack([ditherer.threshold_matrix for ditherer in ditherers]),
+                numpy.stack([ink.lut for ink in inks]))
+    
+    def dispatch(self):
+        """ OverprintFork.dispatch(…) fuses as much of the per-band processing,
+            colorization and compositing as the band processors allow
+        """
+        inked = self.ink_stages()
+        if inked is None:
+            return super(OverprintFork, self).dispatch()
+        stages, inks = inked
+        fused = self.fused_stages()
+        if fused is not None:
+            thresholds, luts = fused
+            
+            def process_fused(image, serial=False):
+                arr = self.split_nd(image).copy()
+                with parallel_region(serial) as parallel:
+                    if parallel:
+                        return Image.fromarray(overprint(arr, thresholds, luts), 'RGB')
+                dither_bands(arr, thresholds, serial=True)
+                return self.fused_compose([Image.fromarray(arr[:, :, idx])
+                                           for idx in range(arr.shape[2])], inks)
+            
+            return process_fused
+        
+        # Run only the stages ahead of each band’s ink, leaving the
+        # colorization and compositing to “fused_compose(…)” sub.:
+        
+        def process_inked(image, serial=False):
+            if serial or in_band_pool():
+                bands = list(self.split(image))
+                for idx, band_stages in enumerate(stages):
+                    for processor in band_stages:
+                        bands[idx] = processor.process(bands[idx])
+                return self.fused_compose(bands, inks)
+            converted = self.convert(image)
+            converted.load() # q.v. “process_bands(…)” supra.
+            futures = [band_pool.submit(process_stages, band_stages, converted, idx)
+                                              for idx, band_stages in enumerate(stages)]
+            return self.fused_compose([future.result() for future in futures], inks)
+        
+        return process_inked
+    
+    def fused_compose(self, bands, inks):
+        """ Colorize each of the (uncolorized) bands with its ink (q.v. the
+           “Ink.colorize(…)” method supra.) and multiply the results together,
+            accumulating in a single ``uint16`` array -- which spares the
+            intermediate RGB image for each band, as well as those of the
+            multiply-mode chain.
+            
+            The output is identical to that of running each band through its
+            ink processor and then calling “compose(…)” on the results.
         """
-        return self.basicgcr.process(image).split()
+        acc = None
+        for band, ink in zip(bands, inks):
+            if band.mode != 'L':
+                band = Mode.L.process(band)
+            colorized = ink.colorize(numpy.asarray(band))
+            if acc is None:
+                acc = colorized.astype(numpy.uint16)
+                continue
+            numpy.multiply(acc, colorized, out=acc)
+            numpy.floor_divide(acc, 255, out=acc)
+        return Image.fromarray(acc.astype(numpy.uint8), 'RGB')
+    
+    def convert(self, image):
+        """ OverprintFork.convert(image) uses imagekit.utils.gcr.BasicGCR(…) to perform
+            gray-component replacement in CMYK-mode images, ahead of splitting them
+            into bands; for more information, see the imagekit.utils.gcr module.
+            If GCR is disabled, images are converted to CMYK mode as need be.
+        """
+        if self.basicgcr is None:
+            return super(OverprintFork, self).convert(image)
+        return self.basicgcr.process(image)
     
     def compose(self, *bands):
-        """ OverprintFork.compose(…) uses PIL.ImageChops.multiply() to create
-            the final composite image output
+        """ OverprintFork.compose(…) multiplies the colorized bands together
+            to create the final composite image output -- accumulating in one
+            ``uint16`` array, rather than with one PIL.ImageChops.multiply()
+            call (and one intermediate image) per band. N.B. as 255 × 255 fits
+            in sixteen bits, the result is identical to that of the latter.
         """
-        return Σ(ImageChops.multiply, bands)
+        acc = numpy.asarray(bands[0]).astype(numpy.uint16)
+        for band in bands[1:]:
+            numpy.multiply(acc, numpy.asarray(band), out=acc)
+            numpy.floor_divide(acc, 255, out=acc)
+        return Image.fromarray(acc.astype(numpy.uint8), bands[0].mode)
 
 class Grid(Fork):
     pass
@@ -421,7 +1082,29 @@ export(RGBInk,              name='RGBInk',          doc="RGBInk → Enumeration
 # Assign the modules’ `__all__` and `__dir__` using the exporter:
 __all__, __dir__ = exporter.all_and_dir()
 
+def run_demo(image_path, mode, show=False):
+    """ Run the demo processors for `mode` over the image file at `image_path`
+        -- this is a module-level function, taking a path rather than an image,
+        so that it can be farmed out to a process pool (q.v. “test()” sub.)
+    """
+    from instakit.processors.halftone import Atkinson
+    image_input = Mode.RGB.open(image_path)
+    outputs = []
+    
+    print('Processing %s with BandForked Atkinson in %s mode...' % (os.path.basename(image_path), mode))
+    outputs.append(BandFork(Atkinson, mode=mode).process(image_input))
+    
+    if mode == 'CMYK':
+        print('Processing %s with OverprintFork-ized Atkinson in CMYK mode...' % os.path.basename(image_path))
+        outputs.append(OverprintFork(Atkinson).process(image_input))
+    
+    if show:
+        for output in outputs:
+            output.show()
+
 def test():
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
     from pprint import pprint
     from instakit.utils.static import asset
     from instakit.processors.halftone import Atkinson
@@ -429,40 +1112,35 @@ def test():
     image_paths = list(map(
         lambda image_file: asset.path('img', image_file),
             asset.listfiles('img')))
-    image_inputs = list(map(
-        lambda image_path: Mode.RGB.open(image_path),
-            image_paths))
     
-    for image_input in image_inputs[:2]:
-        OverprintFork(Atkinson).process(image_input).show()
-        
-        print('Creating OverprintFork and BandFork with Atkinson ditherer...')
+    # Each image and mode is independent, so the demo jobs run in parallel
+    # processes -- unless INSTAKIT_DEMO_SHOW=1, in which case they run one
+    # after another, showing their output images as they go:
+    jobs = [(image_path, mode) for image_path in image_paths[:2]
+                               for mode in ('RGB', 'CMYK')]
+    
+    if os.environ.get('INSTAKIT_DEMO_SHOW') == '1':
+        for image_path, mode in jobs:
+            run_demo(image_path, mode, show=True)
+    else:
+        # N.B. the workers are spawned, not forked -- by now this process
+        # has imported Numba and started the band pool’s threads, neither
+        # of which survives a fork -- so they must be able to import
+        # “run_demo(…)” by name, rather than from a “__main__” module:
+        from instakit.utils.pipeline import run_demo as demo
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+            list(executor.map(demo, *zip(*jobs)))
+    
+    print('Attempting to reset OverprintFork to RGB mode...')
+    import traceback, sys
+    try:
         overatkins = OverprintFork(Atkinson)
-        forkatkins = BandFork(Atkinson)
-        
-        print('Processing image with BandForked Atkinson in default (RGB) mode...')
-        forkatkins.process(image_input).show()
-        forkatkins.mode = 'CMYK'
-        print('Processing image with BandForked Atkinson in CMYK mode...')
-        forkatkins.process(image_input).show()
-        forkatkins.mode = 'RGB'
-        print('Processing image with BandForked Atkinson in RGB mode...')
-        forkatkins.process(image_input).show()
-        
-        overatkins.mode = 'CMYK'
-        print('Processing image with OverprintFork-ized Atkinson in CMYK mode...')
-        overatkins.process(image_input).show()
-        
-        print('Attempting to reset OverprintFork to RGB mode...')
-        import traceback, sys
-        try:
-            overatkins.mode = 'RGB'
-            overatkins.process(image_input).show()
-        except:
-            print(">>>>>>>>>>>>>>>>>>>>> TRACEBACK <<<<<<<<<<<<<<<<<<<<<")
-            traceback.print_exc(file=sys.stdout)
-            print("<<<<<<<<<<<<<<<<<<<<< KCABECART >>>>>>>>>>>>>>>>>>>>>")
-            print('')
+        overatkins.mode = 'RGB'
+    except:
+        print(">>>>>>>>>>>>>>>>>>>>> TRACEBACK <<<<<<<<<<<<<<<<<<<<<")
+        traceback.print_exc(file=sys.stdout)
+        print("<<<<<<<<<<<<<<<<<<<<< KCABECART >>>>>>>>>>>>>>>>>>>>>")
+        print('')
     
     bandfork = BandFork(None)
     pprint(bandfork)
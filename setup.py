@@ -152,6 +152,11 @@ LICENSE = 'MIT'
 # REQUIRED INSTALLATION DEPENDENCIES
 INSTALL_REQUIRES = project_content('requirements', 'install.txt').splitlines()
 
+# OPTIONAL INSTALLATION DEPENDENCIES -- e.g. `pip install instakit[numba]`
+# for the compiled kernels in `instakit.utils.jit`:
+EXTRAS_REQUIRE = {
+    'numba' : project_content('requirements', 'numba.txt').splitlines() }
+
 # PYPI PROJECT CLASSIFIERS
 CLASSIFIERS = [
     'Development Status :: 5 - Production/Stable',
@@ -205,6 +210,7 @@ setup(
     zip_safe=False,
     
     install_requires=INSTALL_REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     include_dirs=include_dirs,
     
     ext_modules=cythonize([
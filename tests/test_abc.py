@@ -0,0 +1,18 @@
+# encoding: utf-8
+from __future__ import print_function
+
+from instakit.abc import NOOp, Processor
+from instakit.processors.adjust import Invert
+from instakit.processors.halftone import SlowAtkinson
+from instakit.utils.pipeline import BandFork, Pipeline
+
+def test_processors_are_not_noops():
+    for processor in (SlowAtkinson(), Invert(), Pipeline(), BandFork(None)):
+        assert isinstance(processor, Processor)
+        assert not isinstance(processor, NOOp)
+    assert isinstance(NOOp(), NOOp)
+
+def test_duck_typed_processors_are_not_noops():
+    from instakit.utils.mode import Mode
+    assert isinstance(Mode.L, Processor)
+    assert not isinstance(Mode.L, NOOp)
@@ -0,0 +1,16 @@
+# encoding: utf-8
+from __future__ import print_function
+
+from PIL import Image
+
+from instakit.utils import gcr
+
+def test_gcr_cache_distinguishes_palettes(monkeypatch):
+    monkeypatch.setattr(gcr, 'gcr_cache_size', 8)
+    monkeypatch.setattr(gcr, 'gcr_cache', type(gcr.gcr_cache)())
+    processor = gcr.BasicGCR(20)
+    for color in ((255, 0, 0), (0, 0, 255)):
+        image = Image.new('P', (4, 4), 0)
+        image.putpalette(list(color) * 256)
+        assert processor.process(image).getpixel((0, 0)) == \
+               gcr.gcr(image, percentage=20).getpixel((0, 0))
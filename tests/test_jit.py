@@ -0,0 +1,55 @@
+# encoding: utf-8
+from __future__ import print_function
+
+import numpy
+
+from instakit.utils.jit import atkinson_diffuse, run_bands
+
+# A 50%-threshold matrix, as per instakit.abc.ThresholdProcessor:
+THRESHOLD = numpy.concatenate((numpy.zeros(128, dtype=numpy.uint8),
+                               numpy.full(128, 255, dtype=numpy.uint8)))
+
+def atkinson_reference(buf, thresh):
+    """ A plain-Python Atkinson dither, against which to check the kernel """
+    height, width = buf.shape
+    for y in range(height):
+        for x in range(width):
+            old = int(buf[y, x])
+            new = int(thresh[old])
+            err = (old - new) >> 3
+            buf[y, x] = new
+            for nx, ny in ((x + 1, y), (x + 2, y),
+                           (x - 1, y + 1), (x, y + 1), (x + 1, y + 1),
+                           (x, y + 2)):
+                if 0 <= nx < width and 0 <= ny < height:
+                    buf[ny, nx] = min(max(int(buf[ny, nx]) + err, 0), 255)
+
+def dithered(kernel, array):
+    buf = array.copy()
+    kernel(buf, THRESHOLD)
+    return buf
+
+def test_atkinson_flat_gray():
+    gray = numpy.full((24, 32), 64, dtype=numpy.uint8)
+    expected = dithered(atkinson_reference, gray)
+    assert numpy.array_equal(dithered(atkinson_diffuse, gray), expected)
+    assert abs(expected.mean() - 64) < 32
+
+def test_atkinson_ramp():
+    ramp = numpy.tile(numpy.arange(256, dtype=numpy.uint8), (16, 1))
+    assert numpy.array_equal(dithered(atkinson_diffuse, ramp),
+                             dithered(atkinson_reference, ramp))
+
+def test_atkinson_matches_py_func():
+    py_func = getattr(atkinson_diffuse, 'py_func', atkinson_diffuse)
+    noise = numpy.random.RandomState(1).randint(0, 256, size=(3, 4)).astype(numpy.uint8)
+    assert numpy.array_equal(dithered(atkinson_diffuse, noise),
+                             dithered(py_func, noise))
+
+def test_run_bands_matches_per_band():
+    noise = numpy.random.RandomState(2).randint(0, 256, size=(12, 16, 3)).astype(numpy.uint8)
+    arr = noise.copy()
+    run_bands(arr, numpy.stack([THRESHOLD] * 3))
+    for c in range(3):
+        assert numpy.array_equal(arr[:, :, c],
+                                 dithered(atkinson_reference, noise[:, :, c]))
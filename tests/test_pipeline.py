@@ -0,0 +1,135 @@
+# encoding: utf-8
+from __future__ import print_function
+
+import numpy
+import threading
+from PIL import Image
+
+from instakit.processors.adjust import Invert
+from instakit.utils.mode import Mode
+from instakit.utils.pipeline import BandFork, OverprintFork, Pipe, Pipeline
+
+def random_image(width=30, height=20, seed=0):
+    rng = numpy.random.RandomState(seed)
+    return Image.fromarray(rng.randint(0, 256, size=(height, width, 3)).astype(numpy.uint8), 'RGB')
+
+def finishes(function, timeout=30):
+    """ Run `function` in a daemon thread; return True if it finished in time """
+    thread = threading.Thread(target=function, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+def test_nested_forks_do_not_deadlock():
+    image = random_image()
+    nested = lambda: Pipeline(BandFork(Invert), Mode.L)
+    assert finishes(lambda: BandFork(nested, mode='CMYK').process(image))
+    assert finishes(lambda: OverprintFork(nested).process(image))
+
+class Adder(object):
+    
+    """ A processor (by duck-typing) that adds to a list of numbers """
+    
+    def __init__(self, amount):
+        self.amount = amount
+    
+    def process(self, values):
+        return [value + self.amount for value in values]
+
+def test_pipelines_pickle_after_processing():
+    import pickle
+    image = random_image()
+    for container in (Pipe(Invert()), Pipeline(Invert(), Invert()),
+                      Pipeline(Invert()).freeze(), OverprintFork(None),
+                      BandFork(Invert).seal()):
+        expected = numpy.asarray(container.process(image))
+        restored = pickle.loads(pickle.dumps(container))
+        assert numpy.array_equal(numpy.asarray(restored.process(image)), expected)
+
+def test_deepcopied_pipelines_use_copied_processors():
+    from copy import deepcopy
+    for container_type in (Pipe, Pipeline):
+        container = container_type(Adder(0), Adder(1))
+        assert container.process([0, 1]) == [1, 2]
+        duplicate = deepcopy(container)
+        duplicate[0].amount = 99
+        assert duplicate.process([0, 1]) == [100, 101]
+        assert container.process([0, 1]) == [1, 2]
+
+def test_sealed_forks_copy_unsealed():
+    from copy import deepcopy
+    fork = BandFork(Invert).seal()
+    assert fork.sealed is not None
+    assert deepcopy(fork).sealed is None
+
+def test_forks_honor_overridden_kernel_processors():
+    from PIL import ImageOps
+    from instakit.processors.halftone import SlowAtkinson
+    
+    class InvertedAtkinson(SlowAtkinson):
+        def process(self, image):
+            return ImageOps.invert(super(InvertedAtkinson, self).process(image))
+    
+    image = random_image()
+    fork = BandFork(InvertedAtkinson, mode='RGB')
+    assert fork.band_kernel(fork.band_list) is None
+    expected = Image.merge('RGB', [InvertedAtkinson().process(band) for band in image.split()])
+    assert fork.process(image).tobytes() == expected.tobytes()
+
+def test_forks_hand_nd_stages_writable_bands(monkeypatch):
+    import instakit.utils.pipeline
+    from instakit.utils.ndarrays import NDProcessor
+    
+    class Halve(NDProcessor):
+        def process_nd(self, ndimage):
+            assert ndimage.flags.writeable and ndimage.flags.c_contiguous
+            ndimage //= 2
+            return ndimage
+    
+    monkeypatch.setattr(instakit.utils.pipeline, 'toimage', lambda array: Image.fromarray(array, 'L'))
+    image = random_image()
+    processed = numpy.asarray(BandFork(Halve, mode='RGB').process(image))
+    assert (processed == numpy.asarray(image) // 2).all()
+
+def test_fused_nd_stages_rescale_between_stages(monkeypatch):
+    import instakit.utils.pipeline
+    from instakit.utils.ndarrays import NDProcessor, bytescale
+    
+    class Dim(NDProcessor):
+        def process_nd(self, ndimage):
+            return ndimage * 0.5
+    
+    class Clip(NDProcessor):
+        def process_nd(self, ndimage):
+            return numpy.minimum(ndimage, 100)
+    
+    monkeypatch.setattr(instakit.utils.pipeline, 'toimage', lambda array: Image.fromarray(bytescale(array)))
+    image = random_image().convert('L')
+    expected = numpy.minimum(bytescale(numpy.asarray(image) * 0.5), 100)
+    assert (numpy.asarray(Pipeline(Dim(), Clip()).process(image)) == expected).all()
+
+NESTED_KERNEL_FORKS = """
+import numpy
+from PIL import Image
+from instakit.processors.halftone import SlowAtkinson
+from instakit.utils.mode import Mode
+from instakit.utils.pipeline import BandFork, OverprintFork, Pipeline
+image = Image.fromarray(numpy.random.RandomState(0).randint(0, 256, (64, 64, 3)).astype(numpy.uint8), 'RGB')
+for fork in (BandFork, OverprintFork):
+    for _ in range(3):
+        BandFork(lambda: Pipeline(fork(SlowAtkinson), Mode.L), mode='RGB').process(image)
+"""
+
+def test_nested_kernel_forks_run_serially():
+    import os, subprocess, sys
+    # N.B. the “workqueue” threading layer aborts the process if parallel
+    # regions are entered from several threads at once:
+    env = dict(os.environ, NUMBA_THREADING_LAYER='workqueue')
+    result = subprocess.run([sys.executable, '-c', NESTED_KERNEL_FORKS], env=env, timeout=300)
+    assert result.returncode == 0
+
+def test_kernel_forks_match_serially():
+    from instakit.processors.halftone import SlowAtkinson
+    image = random_image()
+    for fork in (BandFork(SlowAtkinson, mode='RGB'), OverprintFork(SlowAtkinson)):
+        assert fork.process(image).tobytes() == fork.process(image, serial=True).tobytes()